@@ -0,0 +1,66 @@
+"""
+Benchmark local motion rendering throughput on CPU
+
+Run from the repository root:
+    python -m benchmarks.motion_benchmark
+"""
+import argparse
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from services.motion_service import MotionService, MOTION_EFFECTS
+
+def make_test_image(size: int) -> bytes:
+    """Encode a random-noise PNG the size of a generated scene image"""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    ok, encoded = cv2.imencode(".png", image)
+    if not ok:
+        raise Exception("Could not encode test image")
+    return encoded.tobytes()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local motion rendering")
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=576)
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--image-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    service = MotionService(
+        resolution=(args.width, args.height),
+        fps=args.fps,
+        clip_duration=args.duration
+    )
+    image = make_test_image(args.image_size)
+    source = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    print(f"{args.width}x{args.height} @ {args.fps} fps, {service.num_frames} frames per clip")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        previous_frame = None
+        for effect in MOTION_EFFECTS:
+            # Transform only, then transform + decode + crossfade + mp4 encode
+            start = time.perf_counter()
+            for _ in service.render_frames(source, effect):
+                pass
+            transform_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            previous_frame = service.render_clip(
+                image,
+                os.path.join(temp_dir, f"{effect}.mp4"),
+                effect,
+                previous_frame
+            )
+            clip_time = time.perf_counter() - start
+
+            print(
+                f"{effect:>10}: transform {service.num_frames / transform_time:8.1f} frames/s, "
+                f"full clip {service.num_frames / clip_time:8.1f} frames/s"
+            )
+
+if __name__ == "__main__":
+    main()
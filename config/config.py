@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict
 
 @dataclass
@@ -19,8 +19,36 @@ class APIConfig:
     # API endpoints
     STABILITY_AI_ENDPOINT: str = "https://api.stability.ai/v2beta/image-to-video"
     
+    # Provider models, primary first; set a fallback to "" to disable failover
+    SCRIPT_MODEL: str = "gpt-4"
+    SCRIPT_FALLBACK_MODEL: str = "gpt-4-turbo"
+    AUDIO_MODEL: str = "eleven_monolingual_v1"
+    AUDIO_FALLBACK_MODEL: str = "eleven_multilingual_v2"
+    IMAGE_MODEL: str = "stabilityai/stable-diffusion-xl-base-1.0"
+    IMAGE_FALLBACK_MODEL: str = "stabilityai/stable-diffusion-2-1"
+    
+    # Scene clips
+    TARGET_PLATFORM: str = "youtube"  # sets scene aspect ratio, see PLATFORM_RESOLUTIONS
+    VIDEO_FPS: int = 24
+    MOTION_POLICY: str = "remote"  # "remote", "local" or "hybrid"
+    
+    # Per-job workspaces. In queue mode consecutive stages run in different
+    # worker processes on this host, so every worker must use the same
+    # WORKSPACE_ROOT (and WORKSPACE_TMPFS setting)
+    WORKSPACE_ROOT: str = "temp"
+    # Quota for this node: it covers every job under WORKSPACE_ROOT, which
+    # all workers on the host share. 0 disables the quota
+    WORKSPACE_QUOTA_MB: int = 0
+    WORKSPACE_JOB_RESERVE_MB: int = 500  # estimated peak footprint of one video
+    WORKSPACE_TMPFS: bool = False
+    
+    # Job queue (SQLite; single host only, do not share the file between nodes)
+    JOB_QUEUE_PATH: str = "jobs.db"
+    JOB_VISIBILITY_TIMEOUT: int = 300
+    JOB_MAX_ATTEMPTS: int = 3
+    
     # Other configurations
-    SUPPORTED_VIDEO_FORMATS: Dict[str, str] = {
+    SUPPORTED_VIDEO_FORMATS: Dict[str, str] = field(default_factory=lambda: {
         "youtube": "mp4",
         "instagram": "mp4"
-    } 
\ No newline at end of file
+    }) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 import asyncio
-import os
+from datetime import datetime
 from typing import Dict, List
 from config.config import APIConfig
 from services.script_generator import ScriptGenerator
@@ -7,24 +7,65 @@ from services.audio_service import AudioService
 from services.storage_service import StorageService
 from services.image_service import ImageService
 from services.video_service import VideoService
+from services.motion_service import MotionService
+from services.image_preprocessor import ImagePreprocessor
 from services.transcription_service import TranscriptionService
 from services.publishing_service import PublishingService
 from services.status_tracker import StatusTracker
-from utils.helpers import setup_logging, create_temp_directory, generate_unique_id, cleanup_temp_files
+from utils.helpers import setup_logging, generate_unique_id
+from utils.workspace import WorkspaceManager
 
 logger = setup_logging()
 
+# Pipeline stages in order, with the worker class that should run each one.
+# "cpu" stages run locally heavy work; "io" stages mostly wait on remote APIs.
+PIPELINE_STAGES = [
+    ("script", "io"),
+    ("audio", "io"),
+    ("transcript", "cpu"),
+    ("images", "io"),
+    ("videos", "io"),
+    ("render", "cpu"),
+    ("assembly", "cpu"),
+    ("publish", "io"),
+]
+
+def _model_list(primary: str, fallback: str) -> List[str]:
+    """Primary model followed by its fallback, if one is configured"""
+    return [model for model in (primary, fallback) if model]
+
 class VideoCreationOrchestrator:
     def __init__(self, config: APIConfig):
         self.config = config
-        self.temp_dir = create_temp_directory()
+        self.workspaces = WorkspaceManager(
+            config.WORKSPACE_ROOT,
+            quota_bytes=config.WORKSPACE_QUOTA_MB * 1024 * 1024,
+            job_reserve_bytes=config.WORKSPACE_JOB_RESERVE_MB * 1024 * 1024,
+            use_tmpfs=config.WORKSPACE_TMPFS
+        )
         
         # Initialize services
-        self.script_generator = ScriptGenerator(config.OPENAI_API_KEY)
-        self.audio_service = AudioService(config.ELEVEN_LABS_API_KEY)
+        self.script_generator = ScriptGenerator(
+            config.OPENAI_API_KEY,
+            models=_model_list(config.SCRIPT_MODEL, config.SCRIPT_FALLBACK_MODEL)
+        )
+        self.audio_service = AudioService(
+            config.ELEVEN_LABS_API_KEY,
+            models=_model_list(config.AUDIO_MODEL, config.AUDIO_FALLBACK_MODEL)
+        )
         self.storage_service = StorageService(config.GCS_CREDENTIALS_PATH)
-        self.image_service = ImageService(config.TOGETHER_AI_API_KEY, config.OPENAI_API_KEY)
+        self.image_service = ImageService(
+            config.TOGETHER_AI_API_KEY,
+            config.OPENAI_API_KEY,
+            models=_model_list(config.IMAGE_MODEL, config.IMAGE_FALLBACK_MODEL)
+        )
         self.video_service = VideoService(config.STABILITY_AI_API_KEY)
+        self.image_preprocessor = ImagePreprocessor(config.TARGET_PLATFORM)
+        self.motion_service = MotionService(
+            resolution=self.image_preprocessor.resolution,
+            fps=config.VIDEO_FPS,
+            policy=config.MOTION_POLICY
+        )
         self.transcription_service = TranscriptionService()
         self.publishing_service = PublishingService(
             config.GCS_CREDENTIALS_PATH,
@@ -45,129 +86,251 @@ class VideoCreationOrchestrator:
         Orchestrate the entire video creation and publishing process
         """
         video_id = generate_unique_id()
-        status = {}
-        
+        await self.workspaces.admit(video_id)
+        state = self.initial_state(topic, format_type, duration)
+
         try:
-            # 1. Generate Script
-            logger.info(f"Generating script for video {video_id}")
-            script_data = await self.script_generator.generate_script(topic, format_type, duration)
-            status['script_status'] = 'completed'
-            await self.status_tracker.update_status(video_id, status)
-
-            # 2. Generate Audio
-            logger.info("Generating audio from script")
-            audio_content = await self.audio_service.generate_audio(script_data['script'])
-            audio_path = os.path.join(self.temp_dir, f"{video_id}_audio.mp3")
-            with open(audio_path, 'wb') as f:
-                f.write(audio_content)
-            
-            # Upload audio to GCS
-            audio_url = self.storage_service.upload_file(
-                self.config.AUDIO_BUCKET,
-                audio_path,
-                f"{video_id}/audio.mp3"
-            )
-            status['audio_url'] = audio_url
-            await self.status_tracker.update_status(video_id, status)
-
-            # 3. Generate Transcript
-            logger.info("Generating transcript")
-            transcript_data = await self.transcription_service.generate_transcript(audio_path)
-            status['transcript_status'] = 'completed'
-            await self.status_tracker.update_status(video_id, status)
-
-            # 4. Generate Images
-            logger.info("Generating images")
-            image_prompts = await self.image_service.generate_image_prompts(
-                transcript_data['text']
-            )
-            images = await self.image_service.generate_images(image_prompts)
-            
-            # Save and upload images
-            image_paths = []
-            for idx, image in enumerate(images):
-                image_path = os.path.join(self.temp_dir, f"{video_id}_image_{idx}.png")
-                with open(image_path, 'wb') as f:
-                    f.write(image)
-                image_paths.append(image_path)
-                
-                self.storage_service.upload_file(
-                    self.config.IMAGE_BUCKET,
-                    image_path,
-                    f"{video_id}/images/image_{idx}.png"
-                )
-            
-            status['images_status'] = 'completed'
-            await self.status_tracker.update_status(video_id, status)
-
-            # 5. Generate Videos from Images
-            logger.info("Generating videos from images")
-            videos = await self.video_service.generate_videos_from_images(images)
-            
-            # Save videos
-            video_paths = []
-            for idx, video in enumerate(videos):
-                video_path = os.path.join(self.temp_dir, f"{video_id}_video_{idx}.mp4")
-                with open(video_path, 'wb') as f:
-                    f.write(video)
-                video_paths.append(video_path)
-
-            # 6. Assemble Final Video
-            logger.info("Assembling final video")
-            final_video_path = os.path.join(self.temp_dir, f"{video_id}_final.mp4")
-            await self.video_service.assemble_final_video(
-                video_paths,
-                audio_path,
-                transcript_data['text'],
-                final_video_path
-            )
-            
-            # Upload final video to GCS
-            final_video_url = self.storage_service.upload_file(
-                self.config.VIDEO_BUCKET,
-                final_video_path,
-                f"{video_id}/final_video.mp4"
-            )
-            status['video_status'] = 'completed'
-            await self.status_tracker.update_status(video_id, status)
-
-            # 7. Publish to Platforms
-            logger.info("Publishing video to platforms")
-            youtube_url = await self.publishing_service.upload_to_youtube(
-                final_video_path,
-                script_data['title'],
-                script_data['description'],
-                []  # Add tags if needed
-            )
-            status['youtube_url'] = youtube_url
-            
-            instagram_url = await self.publishing_service.upload_to_instagram(
-                final_video_path,
-                script_data['title']
-            )
-            status['instagram_url'] = instagram_url
-            
-            # 8. Final Status Update
-            status['creation_date'] = datetime.now().isoformat()
-            status['notes'] = 'Successfully completed'
-            await self.status_tracker.update_status(video_id, status)
-
-            # Cleanup
-            cleanup_temp_files(self.temp_dir)
-            
-            return status
+            for stage, _ in PIPELINE_STAGES:
+                state = await self.run_stage(stage, video_id, state)
+                self.finish_stage(stage, video_id)
+
+            return state['status']
+
+        except Exception:
+            self.workspaces.job_workspace(video_id).cleanup()
+            raise
+
+    def close(self) -> None:
+        """Release resources held by services, such as worker process pools"""
+        self.image_preprocessor.close()
+
+    @staticmethod
+    def initial_state(topic: str, format_type: str, duration: int) -> Dict:
+        """Build the state passed between pipeline stages"""
+        return {
+            'topic': topic,
+            'format_type': format_type,
+            'duration': duration,
+            'status': {}
+        }
+
+    async def run_stage(self, stage: str, video_id: str, state: Dict) -> Dict:
+        """
+        Run a single pipeline stage and return the updated state
+
+        State only holds JSON-serializable values so that it can be handed
+        between worker processes through the job queue. Files are referenced
+        by name within the job's workspace, which every worker resolves
+        against its own WORKSPACE_ROOT. Inputs are left in place, also on
+        failure, so a retried stage can pick up where it left off; the caller
+        releases them with finish_stage once the result is committed.
+        """
+        try:
+            state = await getattr(self, f"_stage_{stage}")(video_id, state)
+            await self.status_tracker.update_status(video_id, state['status'])
+            return state
 
         except Exception as e:
             logger.error(f"Error in video creation process: {str(e)}")
-            status['notes'] = f"Error: {str(e)}"
-            await self.status_tracker.update_status(video_id, status)
-            cleanup_temp_files(self.temp_dir)
+            state['status']['notes'] = f"Error: {str(e)}"
+            await self.status_tracker.update_status(video_id, state['status'])
             raise
 
-# Example usage
-async def main():
-    # Load configuration (you'll need to implement this)
-    config = APIConfig(
+    def finish_stage(self, stage: str, video_id: str) -> None:
+        """Delete files no later stage needs, or the whole workspace after the last stage"""
+        workspace = self.workspaces.job_workspace(video_id)
+        if stage == PIPELINE_STAGES[-1][0]:
+            workspace.cleanup()
+        else:
+            workspace.stage_finished(stage)
+
+    async def _stage_script(self, video_id: str, state: Dict) -> Dict:
+        """1. Generate Script"""
+        logger.info(f"Generating script for video {video_id}")
+        state['script_data'] = await self.script_generator.generate_script(
+            state['topic'],
+            state['format_type'],
+            state['duration']
+        )
+        state['status']['script_status'] = 'completed'
+        return state
+
+    async def _stage_audio(self, video_id: str, state: Dict) -> Dict:
+        """2. Generate Audio"""
+        logger.info("Generating audio from script")
+        audio_content = await self.audio_service.generate_audio(state['script_data']['script'])
+        workspace = self.workspaces.job_workspace(video_id)
+        audio_path = workspace.path("audio.mp3")
+        with open(audio_path, 'wb') as f:
+            f.write(audio_content)
+        workspace.register("audio.mp3", ["transcript", "assembly"])
+
+        # Upload audio to GCS
+        audio_url = self.storage_service.upload_file(
+            self.config.AUDIO_BUCKET,
+            audio_path,
+            f"{video_id}/audio.mp3"
+        )
+        state['audio_file'] = "audio.mp3"
+        state['status']['audio_url'] = audio_url
+        return state
+
+    async def _stage_transcript(self, video_id: str, state: Dict) -> Dict:
+        """3. Generate Transcript"""
+        logger.info("Generating transcript")
+        workspace = self.workspaces.job_workspace(video_id)
+        state['transcript_data'] = await self.transcription_service.generate_transcript(
+            workspace.path(state['audio_file'])
+        )
+        state['status']['transcript_status'] = 'completed'
+        return state
+
+    async def _stage_images(self, video_id: str, state: Dict) -> Dict:
+        """4. Generate Images"""
+        logger.info("Generating images")
+        image_prompts = await self.image_service.generate_image_prompts(
+            state['transcript_data']['text']
+        )
+        images = await self.image_service.generate_images(image_prompts)
+
+        # Crop to the platform aspect and re-encode before storing or sending to Stability
+        images = await self.image_preprocessor.preprocess_images(images)
+
+        # Save and upload images
+        workspace = self.workspaces.job_workspace(video_id)
+        image_files = []
+        for idx, image in enumerate(images):
+            image_file = f"image_{idx}.jpg"
+            image_path = workspace.path(image_file)
+            with open(image_path, 'wb') as f:
+                f.write(image)
+            workspace.register(image_file, ["videos", "render"])
+            image_files.append(image_file)
+
+            self.storage_service.upload_file(
+                self.config.IMAGE_BUCKET,
+                image_path,
+                f"{video_id}/images/image_{idx}.jpg"
+            )
+
+        state['image_files'] = image_files
+        state['status']['images_status'] = 'completed'
+        return state
+
+    async def _stage_videos(self, video_id: str, state: Dict) -> Dict:
+        """5. Generate Videos from Images"""
+        logger.info("Generating videos from images")
+        workspace = self.workspaces.job_workspace(video_id)
+        images = []
+        for image_file in state['image_files']:
+            with open(workspace.path(image_file), 'rb') as f:
+                images.append(f.read())
+        backends = self.motion_service.select_backends(len(images))
+
+        # Remote scenes go to Stability AI; local ones are left to the render
+        # stage so CPU work stays off the API workers. A remote scene that
+        # fails, or meets an open circuit, is rendered locally instead so the
+        # generations that did finish are kept.
+        video_files = [f"video_{idx}.mp4" for idx in range(len(images))]
+        for idx, image in enumerate(images):
+            if backends[idx] != "remote":
+                continue
+
+            if not self.video_service.router.available():
+                logger.warning(f"Stability AI unavailable, rendering scene {idx} locally")
+                backends[idx] = "local"
+                continue
+
+            try:
+                video = await self.video_service.generate_video(image)
+            except Exception as e:
+                logger.warning(f"Rendering scene {idx} locally after remote failure: {str(e)}")
+                backends[idx] = "local"
+                continue
+
+            with open(workspace.path(video_files[idx]), 'wb') as f:
+                f.write(video)
+            workspace.register(video_files[idx], ["assembly"])
+
+        state['scene_backends'] = backends
+        state['video_files'] = video_files
+        return state
+
+    async def _stage_render(self, video_id: str, state: Dict) -> Dict:
+        """5b. Render local scenes, crossfading between local neighbours"""
+        workspace = self.workspaces.job_workspace(video_id)
+        previous_frame = None
+        for idx, backend in enumerate(state['scene_backends']):
+            if backend != "local":
+                previous_frame = None
+                continue
+
+            logger.info(f"Rendering scene {idx} locally")
+            with open(workspace.path(state['image_files'][idx]), 'rb') as f:
+                image = f.read()
+            video_file = state['video_files'][idx]
+            # Rendering is CPU bound; keep the event loop free while it runs
+            previous_frame = await asyncio.to_thread(
+                self.motion_service.render_clip,
+                image,
+                workspace.path(video_file),
+                self.motion_service.effect_for_scene(idx),
+                previous_frame
+            )
+            workspace.register(video_file, ["assembly"])
+
+        return state
+
+    async def _stage_assembly(self, video_id: str, state: Dict) -> Dict:
+        """6. Assemble Final Video"""
+        logger.info("Assembling final video")
+        workspace = self.workspaces.job_workspace(video_id)
+        final_video_path = workspace.path("final.mp4")
+        workspace.register("final.mp4", ["publish"])
+        await self.video_service.assemble_final_video(
+            [workspace.path(video_file) for video_file in state['video_files']],
+            workspace.path(state['audio_file']),
+            state['transcript_data']['text'],
+            final_video_path
+        )
+
+        # Upload final video to GCS
+        self.storage_service.upload_file(
+            self.config.VIDEO_BUCKET,
+            final_video_path,
+            f"{video_id}/final_video.mp4"
+        )
+        state['final_video_file'] = "final.mp4"
+        state['status']['video_status'] = 'completed'
+        return state
+
+    async def _stage_publish(self, video_id: str, state: Dict) -> Dict:
+        """7. Publish to Platforms"""
+        logger.info("Publishing video to platforms")
+        script_data = state['script_data']
+        final_video_path = self.workspaces.job_workspace(video_id).path(state['final_video_file'])
+        youtube_url = await self.publishing_service.upload_to_youtube(
+            final_video_path,
+            script_data['title'],
+            script_data['description'],
+            []  # Add tags if needed
+        )
+        state['status']['youtube_url'] = youtube_url
+
+        instagram_url = await self.publishing_service.upload_to_instagram(
+            final_video_path,
+            script_data['title']
+        )
+        state['status']['instagram_url'] = instagram_url
+
+        # 8. Final Status Update
+        state['status']['creation_date'] = datetime.now().isoformat()
+        state['status']['notes'] = 'Successfully completed'
+        return state
+
+def load_config() -> APIConfig:
+    """Load configuration (you'll need to implement this)"""
+    return APIConfig(
         OPENAI_API_KEY="your_openai_key",
         ELEVEN_LABS_API_KEY="your_eleven_labs_key",
         TOGETHER_AI_API_KEY="your_together_ai_key",
@@ -176,6 +339,10 @@ async def main():
         YOUTUBE_API_KEY="your_youtube_key",
         INSTAGRAM_API_KEY="your_instagram_key"
     )
+
+# Example usage
+async def main():
+    config = load_config()
     
     orchestrator = VideoCreationOrchestrator(config)
     
@@ -189,6 +356,8 @@ async def main():
         print("Status:", status)
     except Exception as e:
         print(f"Error creating video: {str(e)}")
+    finally:
+        orchestrator.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
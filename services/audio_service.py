@@ -1,15 +1,24 @@
+import asyncio
 import requests
 import json
-from typing import Optional
+from functools import partial
+from typing import List, Optional
+from services.provider_router import ProviderRouter
 
 class AudioService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, models: Optional[List[str]] = None):
         self.api_key = api_key
         self.base_url = "https://api.elevenlabs.io/v1"
         self.headers = {
             "xi-api-key": api_key,
             "Content-Type": "application/json"
         }
+        # Primary model first, alternates after it
+        models = models or ["eleven_monolingual_v1"]
+        self.router = ProviderRouter(
+            "audio",
+            [(f"elevenlabs:{model}", partial(self._text_to_speech, model=model)) for model in models]
+        )
 
     async def generate_audio(self, text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> bytes:
         """
@@ -17,21 +26,25 @@ class AudioService:
         Default voice_id is "Rachel" - you can change this to any voice ID from Eleven Labs
         """
         try:
-            url = f"{self.base_url}/text-to-speech/{voice_id}"
-            
-            payload = {
-                "text": text,
-                "model_id": "eleven_monolingual_v1",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.75
-                }
+            return await self.router.call(text, voice_id)
+
+        except Exception as e:
+            raise Exception(f"Audio generation failed: {str(e)}")
+
+    async def _text_to_speech(self, text: str, voice_id: str, model: str) -> bytes:
+        """Call Eleven Labs text-to-speech with one model"""
+        url = f"{self.base_url}/text-to-speech/{voice_id}"
+
+        payload = {
+            "text": text,
+            "model_id": model,
+            "voice_settings": {
+                "stability": 0.5,
+                "similarity_boost": 0.75
             }
+        }
 
-            response = requests.post(url, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.content
+        response = await asyncio.to_thread(requests.post, url, json=payload, headers=self.headers)
+        response.raise_for_status()
 
-        except Exception as e:
-            raise Exception(f"Audio generation failed: {str(e)}") 
\ No newline at end of file
+        return response.content
@@ -0,0 +1,101 @@
+import asyncio
+import multiprocessing
+import cv2
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+# Input sizes accepted by Stability AI image-to-video
+STABILITY_RESOLUTIONS = [(1024, 576), (576, 1024), (768, 768)]
+
+# Target frame size per publishing platform
+PLATFORM_RESOLUTIONS = {
+    "youtube": (1024, 576),
+    "instagram": (576, 1024)
+}
+
+def _preprocess_image(image: bytes, width: int, height: int, quality: int) -> bytes:
+    """
+    Center-crop an encoded image to the target aspect, resize and re-encode as JPEG
+
+    Runs in a worker process. The crop is a view into the decoded image, so
+    only one full-size decoded copy exists at a time.
+    """
+    source = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if source is None:
+        raise Exception("Could not decode image")
+
+    src_h, src_w = source.shape[:2]
+    crop_w = min(src_w, int(round(src_h * width / height)))
+    crop_h = min(src_h, int(round(src_w * height / width)))
+    left = (src_w - crop_w) // 2
+    top = (src_h - crop_h) // 2
+    cropped = source[top:top + crop_h, left:left + crop_w]
+
+    if (crop_w, crop_h) != (width, height):
+        # INTER_AREA avoids aliasing when shrinking
+        interpolation = cv2.INTER_AREA if crop_w > width else cv2.INTER_CUBIC
+        resized = cv2.resize(cropped, (width, height), interpolation=interpolation)
+    else:
+        resized = cropped
+    del source, cropped
+
+    ok, encoded = cv2.imencode(".jpg", resized, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise Exception("Could not encode image")
+    return encoded.tobytes()
+
+class ImagePreprocessor:
+    """
+    Resize, crop and re-encode scene images for Stability AI and storage
+
+    Images are converted to the platform's aspect ratio at a size Stability
+    accepts, and re-encoded as JPEG, which is far smaller than the PNGs
+    returned by image generation.
+    """
+
+    def __init__(self, platform: str = "youtube", quality: int = 90, max_workers: Optional[int] = None):
+        if platform not in PLATFORM_RESOLUTIONS:
+            raise Exception(f"Unsupported platform: {platform}")
+
+        self.resolution: Tuple[int, int] = PLATFORM_RESOLUTIONS[platform]
+        if self.resolution not in STABILITY_RESOLUTIONS:
+            raise Exception(f"Resolution {self.resolution} is not accepted by Stability AI")
+
+        self.quality = quality
+        self.max_workers = max_workers
+        self._executor = None
+
+    async def preprocess_images(self, images: List[bytes]) -> List[bytes]:
+        """Preprocess a batch of encoded images across a process pool"""
+        try:
+            if self._executor is None:
+                # Forking a process that already runs API client threads can
+                # deadlock the children, so start them fresh
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+
+            loop = asyncio.get_running_loop()
+            width, height = self.resolution
+            return await asyncio.gather(*[
+                loop.run_in_executor(
+                    self._executor,
+                    _preprocess_image,
+                    image,
+                    width,
+                    height,
+                    self.quality
+                )
+                for image in images
+            ])
+
+        except Exception as e:
+            raise Exception(f"Image preprocessing failed: {str(e)}")
+
+    def close(self) -> None:
+        """Shut down the process pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
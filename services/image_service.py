@@ -1,9 +1,12 @@
+import asyncio
 import requests
-from typing import List, Dict
+from functools import partial
+from typing import List, Dict, Optional
 import openai
+from services.provider_router import ProviderRouter
 
 class ImageService:
-    def __init__(self, together_api_key: str, openai_api_key: str):
+    def __init__(self, together_api_key: str, openai_api_key: str, models: Optional[List[str]] = None):
         self.together_api_key = together_api_key
         self.openai_api_key = openai_api_key
         openai.api_key = openai_api_key
@@ -11,6 +14,12 @@ class ImageService:
             "Authorization": f"Bearer {together_api_key}",
             "Content-Type": "application/json"
         }
+        # Primary model first, alternates after it
+        models = models or ["stabilityai/stable-diffusion-xl-base-1.0"]
+        self.router = ProviderRouter(
+            "image",
+            [(f"together:{model}", partial(self._generate_image, model=model)) for model in models]
+        )
 
     async def generate_image_prompts(self, transcript: str, num_scenes: int = 10) -> List[str]:
         """Generate image prompts based on transcript sections"""
@@ -35,22 +44,27 @@ class ImageService:
         
         for prompt in prompts:
             try:
-                response = requests.post(
-                    "https://api.together.xyz/inference",
-                    headers=self.headers,
-                    json={
-                        "model": "stabilityai/stable-diffusion-xl-base-1.0",
-                        "prompt": prompt,
-                        "negative_prompt": "blurry, low quality, distorted",
-                        "width": 1024,
-                        "height": 1024,
-                        "num_inference_steps": 50
-                    }
-                )
-                response.raise_for_status()
-                images.append(response.content)
+                images.append(await self.router.call(prompt))
                 
             except Exception as e:
                 raise Exception(f"Image generation failed for prompt: {prompt}. Error: {str(e)}")
         
-        return images 
\ No newline at end of file
+        return images
+
+    async def _generate_image(self, prompt: str, model: str) -> bytes:
+        """Generate a single image with one Together AI model"""
+        response = await asyncio.to_thread(
+            requests.post,
+            "https://api.together.xyz/inference",
+            headers=self.headers,
+            json={
+                "model": model,
+                "prompt": prompt,
+                "negative_prompt": "blurry, low quality, distorted",
+                "width": 1024,
+                "height": 1024,
+                "num_inference_steps": 50
+            }
+        )
+        response.raise_for_status()
+        return response.content
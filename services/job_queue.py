@@ -0,0 +1,304 @@
+import json
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+
+class JobQueue:
+    """
+    SQLite-backed work queue shared by producer and worker processes.
+
+    Jobs are leased for a visibility timeout; a worker must heartbeat to keep
+    its lease, otherwise the job becomes visible again for another worker.
+
+    Single host only: any number of processes on one node may share the
+    database file, but SQLite file locking is not reliable over network
+    filesystems, so never share it between nodes. Running workers on
+    several nodes needs a networked queue backend.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        visibility_timeout: int = 300,
+        max_attempts: int = 3,
+        retry_delay: int = 30
+    ):
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._setup_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; one per call so threads and processes never share one"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _setup_schema(self) -> None:
+        """Create the jobs table if it does not exist"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    queue TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    available_at REAL NOT NULL,
+                    lease_token TEXT,
+                    lease_expires REAL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (queue, status, available_at)"
+            )
+        finally:
+            conn.close()
+
+    def enqueue(
+        self,
+        queue: str,
+        payload: Dict[str, Any],
+        max_attempts: Optional[int] = None,
+        delay: int = 0
+    ) -> str:
+        """Add a job to the named queue and return its id"""
+        conn = self._connect()
+        try:
+            return self._insert(conn, queue, payload, max_attempts, delay)
+        finally:
+            conn.close()
+
+    def _insert(
+        self,
+        conn: sqlite3.Connection,
+        queue: str,
+        payload: Dict[str, Any],
+        max_attempts: Optional[int] = None,
+        delay: int = 0
+    ) -> str:
+        """Insert a job row on an existing connection"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn.execute(
+            """INSERT INTO jobs (id, queue, payload, max_attempts, available_at, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                job_id,
+                queue,
+                json.dumps(payload),
+                max_attempts or self.max_attempts,
+                now + delay,
+                now,
+                now
+            )
+        )
+        return job_id
+
+    def lease(self, queue: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next available job from the queue
+
+        Returns:
+            Dict with id, lease_token, attempts and payload, or None if idle
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Jobs whose lease expired on their final attempt are dead, not retried
+            conn.execute(
+                """UPDATE jobs SET status = 'failed', lease_token = NULL, updated_at = ?,
+                       last_error = COALESCE(last_error, 'Lease expired')
+                   WHERE queue = ? AND status = 'leased' AND lease_expires < ?
+                       AND attempts >= max_attempts""",
+                (now, queue, now)
+            )
+
+            row = conn.execute(
+                """SELECT id, attempts, payload FROM jobs
+                   WHERE queue = ? AND available_at <= ? AND (
+                       status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                   )
+                   ORDER BY available_at LIMIT 1""",
+                (queue, now, now)
+            ).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            lease_token = uuid.uuid4().hex
+            conn.execute(
+                """UPDATE jobs SET status = 'leased', attempts = attempts + 1,
+                       lease_token = ?, lease_expires = ?, updated_at = ?
+                   WHERE id = ?""",
+                (lease_token, now + self.visibility_timeout, now, row["id"])
+            )
+            conn.execute("COMMIT")
+
+            return {
+                "id": row["id"],
+                "lease_token": lease_token,
+                "attempts": row["attempts"] + 1,
+                "payload": json.loads(row["payload"])
+            }
+
+        except Exception:
+            # BEGIN itself may have failed (e.g. busy timeout), leaving nothing to roll back
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str, lease_token: str) -> bool:
+        """Extend a lease; returns False if the lease was lost to another worker"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """UPDATE jobs SET lease_expires = ?, updated_at = ?
+                   WHERE id = ? AND lease_token = ? AND status = 'leased'""",
+                (now + self.visibility_timeout, now, job_id, lease_token)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, job_id: str, lease_token: str) -> bool:
+        """Mark a leased job as done"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """UPDATE jobs SET status = 'completed', lease_token = NULL, updated_at = ?
+                   WHERE id = ? AND lease_token = ? AND status = 'leased'""",
+                (time.time(), job_id, lease_token)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete_and_enqueue(
+        self,
+        job_id: str,
+        lease_token: str,
+        queue: str,
+        payload: Dict[str, Any]
+    ) -> bool:
+        """
+        Mark a leased job as done and enqueue its follow-up in one transaction
+
+        Either both happen or neither does, so a crash in between can never
+        leave a completed job without its next stage. Returns False, and
+        enqueues nothing, if the lease was lost.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                """UPDATE jobs SET status = 'completed', lease_token = NULL, updated_at = ?
+                   WHERE id = ? AND lease_token = ? AND status = 'leased'""",
+                (time.time(), job_id, lease_token)
+            )
+            if cursor.rowcount != 1:
+                conn.execute("ROLLBACK")
+                return False
+
+            self._insert(conn, queue, payload)
+            conn.execute("COMMIT")
+            return True
+
+        except Exception:
+            # BEGIN itself may have failed (e.g. busy timeout), leaving nothing to roll back
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def fail(self, job_id: str, lease_token: str, error: str) -> bool:
+        """
+        Release a leased job after an error
+
+        The job is retried after retry_delay until it reaches max_attempts,
+        then it stays in the 'failed' state.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """UPDATE jobs SET
+                       status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                       available_at = ?, lease_token = NULL, lease_expires = NULL,
+                       last_error = ?, updated_at = ?
+                   WHERE id = ? AND lease_token = ? AND status = 'leased'""",
+                (now + self.retry_delay, error, now, job_id, lease_token)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def release(self, job_id: str, lease_token: str, delay: int = 0) -> bool:
+        """Return a leased job to the queue without counting it as an attempt"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """UPDATE jobs SET status = 'pending', attempts = attempts - 1,
+                       available_at = ?, lease_token = NULL, lease_expires = NULL, updated_at = ?
+                   WHERE id = ? AND lease_token = ? AND status = 'leased'""",
+                (now + delay, now, job_id, lease_token)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def active_video_ids(self) -> Set[str]:
+        """Video ids that still have a job waiting or running"""
+        return {video_id for video_id, live in self._video_liveness().items() if live}
+
+    def inactive_video_ids(self) -> Set[str]:
+        """Video ids the queue has seen that have no job waiting or running"""
+        return {video_id for video_id, live in self._video_liveness().items() if not live}
+
+    def _video_liveness(self) -> Dict[str, bool]:
+        """Map every video id with a job row to whether any of its jobs is live"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            # A lease that expired on the final attempt is dead even before
+            # lease() gets around to marking it failed
+            rows = conn.execute(
+                """SELECT json_extract(payload, '$.video_id') AS video_id,
+                          MAX(status = 'pending' OR (
+                              status = 'leased' AND (lease_expires >= ? OR attempts < max_attempts)
+                          )) AS live
+                   FROM jobs GROUP BY video_id""",
+                (now,)
+            ).fetchall()
+            return {row["video_id"]: bool(row["live"]) for row in rows if row["video_id"]}
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the current state of a job"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+
+            job = dict(row)
+            job["payload"] = json.loads(job["payload"])
+            return job
+        finally:
+            conn.close()
@@ -0,0 +1,161 @@
+import cv2
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+MOTION_EFFECTS = ["zoom_in", "pan_right", "zoom_out", "pan_left"]
+MOTION_POLICIES = ["remote", "local", "hybrid"]
+
+class MotionService:
+    """
+    Render still images into Ken Burns style clips locally
+
+    A cheap alternative to Stability image-to-video for scenes where a
+    simple pan or zoom is enough.
+    """
+
+    def __init__(
+        self,
+        resolution: Tuple[int, int] = (1024, 576),
+        fps: int = 24,
+        clip_duration: float = 4.0,
+        crossfade_duration: float = 0.5,
+        max_zoom: float = 1.2,
+        policy: str = "remote",
+        remote_every: int = 3
+    ):
+        if policy not in MOTION_POLICIES:
+            raise Exception(f"Unknown motion policy: {policy}")
+
+        self.width, self.height = resolution
+        self.fps = fps
+        self.num_frames = max(1, int(round(clip_duration * fps)))
+        self.crossfade_frames = min(int(round(crossfade_duration * fps)), self.num_frames)
+        self.max_zoom = max_zoom
+        self.policy = policy
+        self.remote_every = remote_every
+
+    def select_backends(self, num_scenes: int) -> List[str]:
+        """
+        Choose "local" or "remote" rendering for each scene
+
+        Policies:
+            remote: every scene goes to Stability AI
+            local: every scene is rendered here
+            hybrid: every remote_every-th scene (starting with the first) goes
+                to Stability AI, the rest are rendered here
+        """
+        if self.policy == "remote":
+            return ["remote"] * num_scenes
+        if self.policy == "local":
+            return ["local"] * num_scenes
+        return [
+            "remote" if idx % self.remote_every == 0 else "local"
+            for idx in range(num_scenes)
+        ]
+
+    def effect_for_scene(self, scene_index: int) -> str:
+        """Cycle through effects so consecutive scenes move differently"""
+        return MOTION_EFFECTS[scene_index % len(MOTION_EFFECTS)]
+
+    def render_clip(
+        self,
+        image: bytes,
+        output_path: str,
+        effect: str = "zoom_in",
+        previous_frame: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Render an encoded image into an mp4 clip at the target resolution
+
+        If previous_frame is given, the clip opens with a crossfade from it.
+        Returns the last frame so the next clip can crossfade from it.
+        """
+        try:
+            source = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if source is None:
+                raise Exception("Could not decode image")
+
+            writer = cv2.VideoWriter(
+                output_path,
+                cv2.VideoWriter_fourcc(*"mp4v"),
+                self.fps,
+                (self.width, self.height)
+            )
+            if not writer.isOpened():
+                raise Exception(f"Could not open video writer for {output_path}")
+
+            frame = None
+            try:
+                for frame in self.render_frames(source, effect, previous_frame):
+                    writer.write(frame)
+            finally:
+                writer.release()
+
+            return frame
+
+        except Exception as e:
+            raise Exception(f"Motion rendering failed: {str(e)}")
+
+    def render_frames(
+        self,
+        source: np.ndarray,
+        effect: str,
+        previous_frame: Optional[np.ndarray] = None
+    ) -> Iterator[np.ndarray]:
+        """Yield the frames of a clip from a decoded image"""
+        matrices = self._frame_transforms(effect, source.shape[1], source.shape[0])
+
+        if previous_frame is not None and self.crossfade_frames:
+            fade_weights = np.linspace(0, 1, self.crossfade_frames + 1, endpoint=False)[1:]
+        else:
+            fade_weights = np.empty(0)
+
+        for idx in range(self.num_frames):
+            frame = cv2.warpAffine(
+                source,
+                matrices[idx],
+                (self.width, self.height),
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_REFLECT
+            )
+            if idx < len(fade_weights):
+                weight = float(fade_weights[idx])
+                frame = cv2.addWeighted(previous_frame, 1 - weight, frame, weight, 0)
+            yield frame
+
+    def _frame_transforms(self, effect: str, src_w: int, src_h: int) -> np.ndarray:
+        """
+        Compute one source-to-frame affine matrix per frame
+
+        Returns:
+            float32 array of shape (num_frames, 2, 3)
+        """
+        progress = np.linspace(0, 1, self.num_frames)
+
+        if effect == "zoom_in":
+            zoom = 1 + (self.max_zoom - 1) * progress
+        elif effect == "zoom_out":
+            zoom = self.max_zoom - (self.max_zoom - 1) * progress
+        elif effect in ("pan_left", "pan_right"):
+            zoom = np.full(self.num_frames, self.max_zoom)
+        else:
+            raise Exception(f"Unknown motion effect: {effect}")
+
+        # Scale that makes the source cover the frame, times the zoom
+        scale = max(self.width / src_w, self.height / src_h) * zoom
+        window_w = self.width / scale
+        window_h = self.height / scale
+
+        center_x = np.full(self.num_frames, src_w / 2)
+        center_y = np.full(self.num_frames, src_h / 2)
+        if effect == "pan_right":
+            center_x = window_w / 2 + (src_w - window_w) * progress
+        elif effect == "pan_left":
+            center_x = src_w - window_w / 2 - (src_w - window_w) * progress
+
+        matrices = np.zeros((self.num_frames, 2, 3), dtype=np.float32)
+        matrices[:, 0, 0] = scale
+        matrices[:, 1, 1] = scale
+        matrices[:, 0, 2] = -scale * (center_x - window_w / 2)
+        matrices[:, 1, 2] = -scale * (center_y - window_h / 2)
+        return matrices
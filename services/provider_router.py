@@ -0,0 +1,244 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+class LatencyTracker:
+    """Rolling latency and error statistics for one provider"""
+
+    def __init__(self, window: int = 100):
+        self.samples = deque(maxlen=window)  # (latency seconds, succeeded)
+
+    def record(self, latency: float, succeeded: bool) -> None:
+        self.samples.append((latency, succeeded))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile of successful calls, q in [0, 1]"""
+        latencies = sorted(latency for latency, succeeded in self.samples if succeeded)
+        if not latencies:
+            return None
+        return latencies[int(round(q * (len(latencies) - 1)))]
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, succeeded in self.samples if not succeeded) / len(self.samples)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+class CircuitBreaker:
+    """
+    Stop sending traffic to a failing provider
+
+    The circuit opens after failure_threshold consecutive failures, or when
+    the rolling error rate reaches max_error_rate. After reset_timeout one
+    trial request is let through; success closes the circuit again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        max_error_rate: float = 0.5,
+        min_samples: int = 20,
+        reset_timeout: float = 30.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Let a single trial request through
+            self.state = "half_open"
+            return True
+        return False
+
+    def would_allow(self) -> bool:
+        """Like allow_request, without claiming the half-open trial"""
+        if self.state == "closed":
+            return True
+        return self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+
+    def record_cancelled(self) -> None:
+        """A cancelled half-open trial proves nothing; reopen and wait for another trial"""
+        if self.state == "half_open":
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def record_failure(self, tracker: LatencyTracker) -> None:
+        self.consecutive_failures += 1
+        if (
+            self.state == "half_open"
+            or self.consecutive_failures >= self.failure_threshold
+            or (len(tracker) >= self.min_samples and tracker.error_rate() >= self.max_error_rate)
+        ):
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+class ProviderRouter:
+    """
+    Route calls across an ordered list of interchangeable providers
+
+    Providers are (name, async callable) pairs, primary first; name them
+    "provider:model" so statistics are kept per provider and model. A call
+    that runs longer than the provider's p95 is hedged with one duplicate
+    request, and the first result wins. Failed providers fall through to the
+    next alternate, and providers with an open circuit are skipped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        providers: List[Tuple[str, Callable[..., Awaitable[Any]]]],
+        hedge: bool = True,
+        min_samples: int = 20,
+        window: int = 100,
+        failure_threshold: int = 5,
+        max_error_rate: float = 0.5,
+        reset_timeout: float = 30.0
+    ):
+        if not providers:
+            raise Exception(f"Provider router {name} needs at least one provider")
+
+        self.name = name
+        self.providers = providers
+        self.hedge = hedge
+        self.min_samples = min_samples
+        self.trackers = {
+            provider_name: LatencyTracker(window) for provider_name, _ in providers
+        }
+        self.breakers = {
+            provider_name: CircuitBreaker(failure_threshold, max_error_rate, min_samples, reset_timeout)
+            for provider_name, _ in providers
+        }
+
+    def available(self) -> bool:
+        """Whether any provider would currently accept a request"""
+        return any(breaker.would_allow() for breaker in self.breakers.values())
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Current p50/p95 latency, error rate and circuit state per provider"""
+        return {
+            provider_name: {
+                "p50": tracker.percentile(0.5),
+                "p95": tracker.percentile(0.95),
+                "error_rate": tracker.error_rate(),
+                "samples": len(tracker),
+                "circuit": self.breakers[provider_name].state
+            }
+            for provider_name, tracker in self.trackers.items()
+        }
+
+    async def call(self, *args, **kwargs) -> Any:
+        """Call the first healthy provider, failing over to alternates on error"""
+        errors = []
+        for provider_name, provider in self.providers:
+            if not self.breakers[provider_name].allow_request():
+                continue
+
+            try:
+                return await self._call_hedged(provider_name, provider, args, kwargs)
+            except Exception as e:
+                errors.append(f"{provider_name}: {str(e)}")
+
+        if not errors:
+            raise Exception(f"All {self.name} providers have open circuits")
+        raise Exception(f"All {self.name} providers failed. " + "; ".join(errors))
+
+    async def _call_hedged(self, provider_name: str, provider: Callable, args: tuple, kwargs: dict) -> Any:
+        """Call one provider, sending a duplicate request if it runs past its p95"""
+        tasks = {asyncio.ensure_future(self._timed_call(provider_name, provider, args, kwargs))}
+
+        hedge_delay = None
+        if self.hedge and len(self.trackers[provider_name]) >= self.min_samples:
+            hedge_delay = self.trackers[provider_name].percentile(0.95)
+
+        try:
+            last_error = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks,
+                    timeout=hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    tasks.add(asyncio.ensure_future(self._timed_call(provider_name, provider, args, kwargs)))
+                    hedge_delay = None
+                    continue
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+            raise last_error
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed_call(self, provider_name: str, provider: Callable, args: tuple, kwargs: dict) -> Any:
+        """Call a provider and record its latency and outcome"""
+        start = time.monotonic()
+        try:
+            result = await provider(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Losing hedge; says nothing about provider health, but a
+            # cancelled half-open trial must not leave the circuit stuck
+            self.breakers[provider_name].record_cancelled()
+            raise
+        except Exception:
+            self.trackers[provider_name].record(time.monotonic() - start, False)
+            self.breakers[provider_name].record_failure(self.trackers[provider_name])
+            raise
+
+        self.trackers[provider_name].record(time.monotonic() - start, True)
+        self.breakers[provider_name].record_success()
+        return result
+
+class StandInProvider:
+    """
+    Fake provider for exercising routing without calling real APIs
+
+    Returns a fixed result after a delay. slow_rate of calls take
+    slow_latency instead, to simulate tail latency, and failure_rate of
+    calls raise.
+    """
+
+    def __init__(
+        self,
+        result: Any,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.result = result
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        self.calls += 1
+        slow = self.random.random() < self.slow_rate
+        await asyncio.sleep(self.slow_latency if slow else self.latency)
+        if self.random.random() < self.failure_rate:
+            raise Exception("Stand-in provider failure")
+        return self.result
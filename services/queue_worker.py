@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from services.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+class QueueWorker:
+    """
+    Lease pipeline stages of one worker class from the job queue and run them
+
+    stages is the ordered pipeline as (stage, worker class) pairs; the
+    orchestrator runs a stage with run_stage and releases its inputs with
+    finish_stage.
+
+    When a stage finishes, the next stage is enqueued on the queue of the
+    worker class that owns it, so CPU-heavy and API-bound stages run in
+    separate pools of worker processes. All workers run on one host: they
+    share the SQLite queue database and WORKSPACE_ROOT, because each stage
+    reads the files the previous one left in the job's workspace.
+    """
+
+    def __init__(
+        self,
+        orchestrator,
+        job_queue: JobQueue,
+        stages: List[Tuple[str, str]],
+        worker_class: str,
+        poll_interval: float = 5,
+        heartbeat_interval: Optional[float] = None
+    ):
+        self.orchestrator = orchestrator
+        self.job_queue = job_queue
+        self.stage_order = [stage for stage, _ in stages]
+        self.stage_worker_classes = dict(stages)
+        self.worker_class = worker_class
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or job_queue.visibility_timeout / 3
+
+    async def run(self, max_jobs: Optional[int] = None) -> None:
+        """Process jobs until max_jobs stages have run (forever if None)"""
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            try:
+                job = self.job_queue.lease(self.worker_class)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not lease a job, retrying on next poll: {str(e)}")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            try:
+                ran = await self.process_job(job)
+            except sqlite3.Error as e:
+                # The lease expires and the stage is retried by whoever leases it next
+                logger.warning(f"Queue error while handling job {job['id']}: {str(e)}")
+                ran = True
+            if ran:
+                processed += 1
+
+    async def process_job(self, job: Dict) -> bool:
+        """
+        Run one leased stage, keeping the lease alive while it runs
+
+        Returns:
+            False if the stage was deferred by the workspace quota, True otherwise
+        """
+        payload = job['payload']
+        video_id = payload['video_id']
+        stage = payload['stage']
+
+        # Only throttle new videos; stages of admitted ones must run to free disk
+        if stage == self.stage_order[0] and not self._admit(video_id):
+            logger.info(f"Workspace quota reached, deferring video {video_id}")
+            self.job_queue.release(job['id'], job['lease_token'], delay=int(self.poll_interval))
+            return False
+
+        logger.info(f"Worker {self.worker_class} running stage {stage} for video {video_id}")
+
+        # Stage code blocks the event loop on synchronous API calls, so the
+        # heartbeat runs on its own thread
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(job['id'], job['lease_token'], stop_heartbeat),
+            daemon=True
+        )
+        heartbeat.start()
+
+        try:
+            state = await self.orchestrator.run_stage(stage, video_id, payload['state'])
+        except Exception as e:
+            stop_heartbeat.set()
+            heartbeat.join()
+            self.job_queue.fail(job['id'], job['lease_token'], str(e))
+            if self.job_queue.get_job(job['id'])['status'] == 'failed':
+                # Out of retries; nothing will read this video's files again
+                self.orchestrator.workspaces.job_workspace(video_id).cleanup()
+            return True
+
+        stop_heartbeat.set()
+        heartbeat.join()
+
+        next_index = self.stage_order.index(stage) + 1
+        if next_index < len(self.stage_order):
+            next_stage = self.stage_order[next_index]
+            completed = self.job_queue.complete_and_enqueue(
+                job['id'],
+                job['lease_token'],
+                self.stage_worker_classes[next_stage],
+                {'video_id': video_id, 'stage': next_stage, 'state': state}
+            )
+        else:
+            completed = self.job_queue.complete(job['id'], job['lease_token'])
+
+        if not completed:
+            logger.warning(f"Lease lost for stage {stage} of video {video_id}, dropping result")
+            return True
+
+        # Only now is it safe to delete this stage's inputs; with a lost lease
+        # the worker that re-ran the stage still needs them
+        self.orchestrator.finish_stage(stage, video_id)
+        return True
+
+    def _admit(self, video_id: str) -> bool:
+        """Reclaim abandoned workspaces, then try to admit a new video"""
+        workspaces = self.orchestrator.workspaces
+        workspaces.sweep(self.job_queue.inactive_video_ids())
+        return workspaces.try_admit(video_id)
+
+    def _heartbeat(self, job_id: str, lease_token: str, stop: threading.Event) -> None:
+        """Extend the lease until stopped"""
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                if not self.job_queue.heartbeat(job_id, lease_token):
+                    logger.warning(f"Lost lease on job {job_id}")
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"Heartbeat for job {job_id} failed, retrying: {str(e)}")
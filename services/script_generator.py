@@ -1,9 +1,16 @@
 import openai
-from typing import Dict, Optional
+from functools import partial
+from typing import Dict, List, Optional
+from services.provider_router import ProviderRouter
 
 class ScriptGenerator:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, models: Optional[List[str]] = None):
         openai.api_key = api_key
+        # Primary model first, alternates after it. Scripts and metadata get
+        # separate routers because their latencies differ by an order of magnitude
+        models = models or ["gpt-4"]
+        self.script_router = self._build_router("script", models)
+        self.metadata_router = self._build_router("metadata", models)
         
     async def generate_script(self, topic: str, format_type: str, duration: int) -> Dict[str, str]:
         """
@@ -27,15 +34,10 @@ class ScriptGenerator:
         Also provide timestamps for each section."""
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional video script writer."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            script = response.choices[0].message.content
+            script = await self.script_router.call([
+                {"role": "system", "content": "You are a professional video script writer."},
+                {"role": "user", "content": prompt}
+            ])
             
             # Generate title and description
             metadata = await self._generate_metadata(script)
@@ -52,15 +54,10 @@ class ScriptGenerator:
     async def _generate_metadata(self, script: str) -> Dict[str, str]:
         """Generate video title and description based on the script"""
         try:
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Generate an engaging title and description for this video script."},
-                    {"role": "user", "content": script}
-                ]
-            )
-            
-            metadata = response.choices[0].message.content
+            metadata = await self.metadata_router.call([
+                {"role": "system", "content": "Generate an engaging title and description for this video script."},
+                {"role": "user", "content": script}
+            ])
             # Parse the response to extract title and description
             # Assuming the response is formatted as "Title: xxx\nDescription: yyy"
             lines = metadata.split("\n")
@@ -73,4 +70,19 @@ class ScriptGenerator:
             }
             
         except Exception as e:
-            raise Exception(f"Metadata generation failed: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Metadata generation failed: {str(e)}")
+
+    def _build_router(self, name: str, models: List[str]) -> ProviderRouter:
+        """Router over the given models for one kind of request"""
+        return ProviderRouter(
+            name,
+            [(f"openai:{model}", partial(self._chat, model=model)) for model in models]
+        )
+
+    async def _chat(self, messages: List[Dict[str, str]], model: str) -> str:
+        """Run a chat completion with one model and return the reply text"""
+        response = await openai.ChatCompletion.acreate(
+            model=model,
+            messages=messages
+        )
+        return response.choices[0].message.content
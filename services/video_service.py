@@ -1,8 +1,9 @@
+import asyncio
 import requests
-import time
 from typing import List, Dict
 import moviepy.editor as mp
 from moviepy.editor import VideoFileClip, AudioFileClip, TextClip, CompositeVideoClip
+from services.provider_router import ProviderRouter
 
 class VideoService:
     def __init__(self, api_key: str):
@@ -12,44 +13,65 @@ class VideoService:
             "Content-Type": "application/json"
         }
         self.base_url = "https://api.stability.ai/v2beta/image-to-video"
+        # Generations are paid and slow, so track latency and trip the circuit
+        # on failures but never send hedged duplicates
+        self.router = ProviderRouter(
+            "video",
+            [("stability:image-to-video", self._generate_video)],
+            hedge=False
+        )
 
     async def generate_videos_from_images(self, image_files: List[bytes]) -> List[bytes]:
         """Generate videos from images using Stability AI"""
         videos = []
         
         for image in image_files:
-            try:
-                # Initialize video generation
-                response = requests.post(
-                    f"{self.base_url}",
-                    headers=self.headers,
-                    files={"image": image}
-                )
-                response.raise_for_status()
-                generation_id = response.json()["id"]
+            videos.append(await self.generate_video(image))
 
-                # Poll for completion
-                video_bytes = await self._poll_generation(generation_id)
-                videos.append(video_bytes)
+        return videos
 
-            except Exception as e:
-                raise Exception(f"Video generation failed: {str(e)}")
+    async def generate_video(self, image: bytes) -> bytes:
+        """Generate a video from a single image using Stability AI"""
+        try:
+            return await self.router.call(image)
 
-        return videos
+        except Exception as e:
+            raise Exception(f"Video generation failed: {str(e)}")
+
+    async def _generate_video(self, image: bytes) -> bytes:
+        """Start a Stability AI generation for one image and wait for the result"""
+        response = await asyncio.to_thread(
+            requests.post,
+            f"{self.base_url}",
+            headers=self.headers,
+            files={"image": self._image_file(image)}
+        )
+        response.raise_for_status()
+        generation_id = response.json()["id"]
+
+        # Poll for completion
+        return await self._poll_generation(generation_id)
+
+    def _image_file(self, image: bytes) -> tuple:
+        """Name the upload with the right content type; preprocessed images are JPEG"""
+        if image.startswith(b"\x89PNG"):
+            return ("image.png", image, "image/png")
+        return ("image.jpg", image, "image/jpeg")
 
     async def _poll_generation(self, generation_id: str, max_attempts: int = 60) -> bytes:
         """Poll for video generation completion"""
         attempts = 0
         while attempts < max_attempts:
             try:
-                response = requests.get(
+                response = await asyncio.to_thread(
+                    requests.get,
                     f"{self.base_url}/result/{generation_id}",
                     headers=self.headers
                 )
                 
                 if response.status_code == 202:
                     # Still processing
-                    time.sleep(5)
+                    await asyncio.sleep(5)
                     attempts += 1
                     continue
                     
@@ -59,9 +81,11 @@ class VideoService:
             except Exception as e:
                 if attempts == max_attempts - 1:
                     raise Exception(f"Video generation polling failed: {str(e)}")
-                time.sleep(5)
+                await asyncio.sleep(5)
                 attempts += 1
 
+        raise Exception(f"Video generation {generation_id} did not finish in time")
+
     async def assemble_final_video(
         self,
         video_files: List[str],
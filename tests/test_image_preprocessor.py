@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from services.image_preprocessor import ImagePreprocessor, _preprocess_image
+
+def encode_png(width, height):
+    # Left half dark, right half bright, so crops and resizes keep a visible edge
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:, width // 2:] = 255
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return encoded.tobytes()
+
+def decode(data):
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+def is_jpeg(data):
+    return data[:3] == b"\xff\xd8\xff"
+
+@pytest.mark.parametrize("platform, expected_shape", [
+    ("youtube", (576, 1024, 3)),
+    ("instagram", (1024, 576, 3)),
+])
+def test_square_png_becomes_platform_jpeg(platform, expected_shape):
+    preprocessor = ImagePreprocessor(platform)
+    try:
+        result = asyncio.run(preprocessor.preprocess_images([encode_png(1024, 1024)] * 2))
+    finally:
+        preprocessor.close()
+
+    assert len(result) == 2
+    for data in result:
+        assert is_jpeg(data)
+        assert decode(data).shape == expected_shape
+
+def test_wide_input_is_center_cropped():
+    # 2000x500 is wider than 16:9, so the sides are cropped away
+    output = decode(_preprocess_image(encode_png(2000, 500), 1024, 576, 90))
+
+    assert output.shape == (576, 1024, 3)
+    # The dark/bright edge stays in the middle after a center crop
+    assert output[:, 100].mean() < 30
+    assert output[:, 924].mean() > 225
+
+def test_smaller_input_is_upscaled():
+    output = decode(_preprocess_image(encode_png(320, 240), 576, 1024, 90))
+
+    assert output.shape == (1024, 576, 3)
+
+def test_undecodable_image_raises():
+    with pytest.raises(Exception, match="Could not decode image"):
+        _preprocess_image(b"not an image", 1024, 576, 90)
+
+def test_unknown_platform_raises():
+    with pytest.raises(Exception, match="Unsupported platform"):
+        ImagePreprocessor("tiktok")
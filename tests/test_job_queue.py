@@ -0,0 +1,134 @@
+import sqlite3
+import time
+import pytest
+from services.job_queue import JobQueue
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"), visibility_timeout=1, max_attempts=2, retry_delay=0)
+
+def test_lease_only_returns_jobs_from_its_queue(job_queue):
+    job_id = job_queue.enqueue("io", {"video_id": "vid_1"})
+
+    assert job_queue.lease("cpu") is None
+    job = job_queue.lease("io")
+    assert job["id"] == job_id
+    assert job["attempts"] == 1
+    assert job["payload"] == {"video_id": "vid_1"}
+
+def test_leased_job_is_invisible_until_lease_expires(job_queue):
+    job_queue.enqueue("io", {})
+    first = job_queue.lease("io")
+
+    assert job_queue.lease("io") is None
+    time.sleep(1.1)
+    second = job_queue.lease("io")
+    assert second["id"] == first["id"]
+    assert second["attempts"] == 2
+
+    # The expired lease can no longer heartbeat or complete
+    assert not job_queue.heartbeat(first["id"], first["lease_token"])
+    assert not job_queue.complete(first["id"], first["lease_token"])
+    assert job_queue.complete(second["id"], second["lease_token"])
+
+def test_heartbeat_keeps_lease(job_queue):
+    job_queue.enqueue("io", {})
+    job = job_queue.lease("io")
+
+    time.sleep(0.6)
+    assert job_queue.heartbeat(job["id"], job["lease_token"])
+    time.sleep(0.6)
+    assert job_queue.lease("io") is None
+
+def test_fail_retries_until_max_attempts(job_queue):
+    job_id = job_queue.enqueue("io", {})
+
+    job = job_queue.lease("io")
+    job_queue.fail(job["id"], job["lease_token"], "boom")
+    assert job_queue.get_job(job_id)["status"] == "pending"
+
+    job = job_queue.lease("io")
+    job_queue.fail(job["id"], job["lease_token"], "boom again")
+    failed = job_queue.get_job(job_id)
+    assert failed["status"] == "failed"
+    assert failed["last_error"] == "boom again"
+    assert job_queue.lease("io") is None
+
+def test_lease_expiring_on_last_attempt_fails_job(job_queue):
+    job_id = job_queue.enqueue("io", {})
+    job_queue.lease("io")
+    time.sleep(1.1)
+    job_queue.lease("io")
+    time.sleep(1.1)
+
+    assert job_queue.lease("io") is None
+    assert job_queue.get_job(job_id)["status"] == "failed"
+
+def test_release_does_not_use_an_attempt(job_queue):
+    job_id = job_queue.enqueue("io", {})
+    job = job_queue.lease("io")
+
+    assert job_queue.release(job["id"], job["lease_token"])
+    assert job_queue.get_job(job_id)["attempts"] == 0
+    assert job_queue.lease("io")["attempts"] == 1
+
+def test_complete_and_enqueue_hands_off_next_stage(job_queue):
+    job_id = job_queue.enqueue("io", {"stage": "audio"})
+    job = job_queue.lease("io")
+
+    assert job_queue.complete_and_enqueue(job["id"], job["lease_token"], "cpu", {"stage": "transcript"})
+    assert job_queue.get_job(job_id)["status"] == "completed"
+    assert job_queue.lease("cpu")["payload"] == {"stage": "transcript"}
+
+def test_complete_and_enqueue_with_lost_lease_enqueues_nothing(job_queue):
+    job_queue.enqueue("io", {})
+    stale = job_queue.lease("io")
+    time.sleep(1.1)
+    job_queue.lease("io")
+
+    assert not job_queue.complete_and_enqueue(stale["id"], stale["lease_token"], "cpu", {})
+    assert job_queue.lease("cpu") is None
+
+def test_video_ids_split_by_live_jobs(job_queue):
+    job_queue.enqueue("io", {"video_id": "vid_pending"})
+    job_queue.enqueue("cpu", {"video_id": "vid_done"})
+    job = job_queue.lease("cpu")
+    job_queue.complete(job["id"], job["lease_token"])
+
+    job_queue.enqueue("gpu", {"video_id": "vid_dead"})
+    job_queue.lease("gpu")
+    time.sleep(1.1)
+    job_queue.lease("gpu")
+    time.sleep(1.1)
+
+    # vid_dead's final lease expired but lease() has not marked it failed yet
+    assert job_queue.active_video_ids() == {"vid_pending"}
+    assert job_queue.inactive_video_ids() == {"vid_done", "vid_dead"}
+
+def test_video_with_any_live_job_is_active(job_queue):
+    job_queue.enqueue("io", {"video_id": "vid_1", "stage": "audio"})
+    job = job_queue.lease("io")
+    job_queue.complete_and_enqueue(job["id"], job["lease_token"], "cpu", {"video_id": "vid_1", "stage": "transcript"})
+
+    assert job_queue.active_video_ids() == {"vid_1"}
+    assert job_queue.inactive_video_ids() == set()
+
+def test_busy_database_surfaces_lock_error_not_rollback_error(job_queue, monkeypatch):
+    job_queue.enqueue("io", {})
+    blocker = sqlite3.connect(job_queue.db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+
+    def connect_with_short_timeout():
+        conn = sqlite3.connect(job_queue.db_path, timeout=0.1, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    monkeypatch.setattr(job_queue, "_connect", connect_with_short_timeout)
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            job_queue.lease("io")
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            job_queue.complete_and_enqueue("job", "token", "cpu", {})
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
@@ -0,0 +1,75 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from services.motion_service import MOTION_EFFECTS, MotionService
+
+def make_service(**kwargs):
+    options = dict(resolution=(64, 36), fps=10, clip_duration=1.0, crossfade_duration=0.3)
+    options.update(kwargs)
+    return MotionService(**options)
+
+def test_select_backends_per_policy():
+    assert make_service(policy="remote").select_backends(3) == ["remote"] * 3
+    assert make_service(policy="local").select_backends(3) == ["local"] * 3
+    assert make_service(policy="hybrid", remote_every=3).select_backends(7) == [
+        "remote", "local", "local", "remote", "local", "local", "remote"
+    ]
+
+def test_unknown_policy_raises():
+    with pytest.raises(Exception, match="Unknown motion policy"):
+        make_service(policy="sometimes")
+
+@pytest.mark.parametrize("effect", MOTION_EFFECTS)
+@pytest.mark.parametrize("src_w, src_h", [(1024, 576), (1024, 1024), (300, 900)])
+def test_frame_window_stays_inside_source(effect, src_w, src_h):
+    service = make_service(max_zoom=1.2)
+    matrices = service._frame_transforms(effect, src_w, src_h)
+    assert matrices.shape == (service.num_frames, 2, 3)
+
+    scale = matrices[:, 0, 0].astype(np.float64)
+    left = -matrices[:, 0, 2] / scale
+    top = -matrices[:, 1, 2] / scale
+    eps = 1e-3
+    assert np.all(left >= -eps)
+    assert np.all(top >= -eps)
+    assert np.all(left + service.width / scale <= src_w + eps)
+    assert np.all(top + service.height / scale <= src_h + eps)
+
+    # Zoom relative to the scale at which the source just covers the frame
+    zoom = scale / max(service.width / src_w, service.height / src_h)
+    expected = {
+        "zoom_in": (1.0, 1.2),
+        "zoom_out": (1.2, 1.0),
+        "pan_left": (1.2, 1.2),
+        "pan_right": (1.2, 1.2),
+    }[effect]
+    assert zoom[0] == pytest.approx(expected[0], rel=1e-4)
+    assert zoom[-1] == pytest.approx(expected[1], rel=1e-4)
+
+def test_unknown_effect_raises():
+    with pytest.raises(Exception, match="Unknown motion effect"):
+        make_service()._frame_transforms("spin", 100, 100)
+
+def test_render_frames_shape_and_count():
+    service = make_service()
+    source = np.random.default_rng(0).integers(0, 256, (90, 120, 3), dtype=np.uint8)
+
+    frames = list(service.render_frames(source, "pan_right"))
+
+    assert len(frames) == service.num_frames
+    assert all(frame.shape == (36, 64, 3) for frame in frames)
+
+def test_crossfade_only_blends_leading_frames_with_previous_frame():
+    service = make_service()
+    assert service.crossfade_frames == 3
+    source = np.full((90, 120, 3), 200, dtype=np.uint8)
+    previous = np.zeros((36, 64, 3), dtype=np.uint8)
+
+    faded = [int(frame.mean()) for frame in service.render_frames(source, "zoom_in", previous)]
+    assert faded[0] < faded[1] < faded[2] < 200
+    assert faded[3:] == [200] * (service.num_frames - 3)
+
+    plain = [int(frame.mean()) for frame in service.render_frames(source, "zoom_in")]
+    assert plain == [200] * service.num_frames
@@ -0,0 +1,124 @@
+import asyncio
+import time
+import pytest
+from services.provider_router import CircuitBreaker, LatencyTracker, ProviderRouter, StandInProvider
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_latency_tracker_percentiles_and_error_rate():
+    tracker = LatencyTracker(window=10)
+    for latency in [0.1, 0.2, 0.3, 0.4]:
+        tracker.record(latency, True)
+    tracker.record(5.0, False)
+
+    assert tracker.percentile(0.5) == 0.3
+    assert tracker.percentile(0.95) == 0.4
+    assert tracker.error_rate() == pytest.approx(0.2)
+
+def test_fails_over_to_alternate():
+    primary = StandInProvider("primary", failure_rate=1.0)
+    alternate = StandInProvider("alternate")
+    router = ProviderRouter("image", [("a:m1", primary), ("b:m2", alternate)])
+
+    assert run(router.call("prompt")) == "alternate"
+    assert primary.calls == 1
+    assert router.get_stats()["a:m1"]["error_rate"] == 1.0
+
+def test_raises_when_every_provider_fails():
+    router = ProviderRouter("image", [("a:m1", StandInProvider("x", failure_rate=1.0))])
+
+    with pytest.raises(Exception, match="All image providers failed"):
+        run(router.call())
+
+def test_hedges_call_slower_than_p95():
+    async def scenario():
+        router = ProviderRouter("image", [("a:m1", StandInProvider("warmup", latency=0.01))], min_samples=5)
+        for _ in range(5):
+            await router.call()
+
+        # First request is stuck in the tail; the hedged duplicate returns first
+        slow = StandInProvider("slow", latency=1.0)
+        fast = StandInProvider("hedge", latency=0.01)
+        calls = []
+
+        async def first_call_slow(*args):
+            calls.append(len(calls))
+            return await (slow() if len(calls) == 1 else fast())
+
+        router.providers = [("a:m1", first_call_slow)]
+        start = time.monotonic()
+        result = await router.call()
+        return result, time.monotonic() - start, len(calls)
+
+    result, elapsed, calls = run(scenario())
+    assert result == "hedge"
+    assert calls == 2
+    assert elapsed < 0.5
+
+def test_no_hedge_when_disabled():
+    async def scenario():
+        provider = StandInProvider("ok", latency=0.01)
+        router = ProviderRouter("video", [("a:m1", provider)], hedge=False, min_samples=5)
+        for _ in range(5):
+            await router.call()
+        provider.latency = 0.1
+        await router.call()
+        return provider.calls
+
+    assert run(scenario()) == 6
+
+def test_circuit_opens_then_recovers_through_half_open_trial():
+    async def scenario():
+        primary = StandInProvider("primary", failure_rate=1.0)
+        alternate = StandInProvider("alternate")
+        router = ProviderRouter(
+            "audio",
+            [("a:m1", primary), ("b:m2", alternate)],
+            failure_threshold=2,
+            reset_timeout=0.1
+        )
+        for _ in range(4):
+            await router.call()
+        assert primary.calls == 2
+        assert router.breakers["a:m1"].state == "open"
+
+        await asyncio.sleep(0.15)
+        primary.failure_rate = 0.0
+        assert await router.call() == "primary"
+        assert router.breakers["a:m1"].state == "closed"
+
+    run(scenario())
+
+def test_cancelled_half_open_trial_reopens_circuit():
+    async def scenario():
+        provider = StandInProvider("slow", latency=1.0)
+        router = ProviderRouter("video", [("a:m1", provider)], hedge=False, reset_timeout=0.1)
+        breaker = router.breakers["a:m1"]
+        breaker.state, breaker.opened_at = "open", time.monotonic() - 1
+
+        task = asyncio.ensure_future(router.call())
+        await asyncio.sleep(0.05)
+        assert breaker.state == "half_open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker.state == "open"
+        assert not router.available()
+        await asyncio.sleep(0.15)
+        assert router.available()
+
+    run(scenario())
+
+def test_circuit_opens_on_error_rate():
+    breaker = CircuitBreaker(failure_threshold=100, max_error_rate=0.5, min_samples=4)
+    tracker = LatencyTracker()
+    for succeeded in [True, False, True, False]:
+        tracker.record(0.1, succeeded)
+        if succeeded:
+            breaker.record_success()
+        else:
+            breaker.record_failure(tracker)
+
+    assert breaker.state == "open"
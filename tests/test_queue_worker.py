@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+import pytest
+from services.job_queue import JobQueue
+from services.queue_worker import QueueWorker
+from utils.workspace import WorkspaceManager
+
+STAGES = [("script", "io"), ("audio", "io"), ("transcript", "cpu")]
+
+class FakeOrchestrator:
+    """Runs stages in memory and records which stages finished"""
+
+    def __init__(self, workspaces, error=None):
+        self.workspaces = workspaces
+        self.error = error
+        self.finished = []
+
+    async def run_stage(self, stage, video_id, state):
+        if self.error:
+            raise self.error
+        return {**state, 'done': state.get('done', []) + [stage]}
+
+    def finish_stage(self, stage, video_id):
+        self.finished.append((stage, video_id))
+
+def make_worker(tmp_path, worker_class="io", max_attempts=2, error=None):
+    job_queue = JobQueue(str(tmp_path / "jobs.db"), visibility_timeout=1, max_attempts=max_attempts, retry_delay=0)
+    orchestrator = FakeOrchestrator(WorkspaceManager(str(tmp_path / "temp")), error=error)
+    return QueueWorker(orchestrator, job_queue, STAGES, worker_class, poll_interval=0)
+
+def lease_stage(worker, stage, video_id="vid_1"):
+    worker.job_queue.enqueue(
+        worker.stage_worker_classes[stage],
+        {'video_id': video_id, 'stage': stage, 'state': {}}
+    )
+    return worker.job_queue.lease(worker.stage_worker_classes[stage])
+
+def test_successful_stage_hands_off_to_next_worker_class(tmp_path):
+    worker = make_worker(tmp_path)
+    job = lease_stage(worker, "audio")
+
+    asyncio.run(worker.process_job(job))
+
+    assert worker.job_queue.get_job(job['id'])['status'] == "completed"
+    assert worker.job_queue.lease("io") is None
+    next_job = worker.job_queue.lease("cpu")
+    assert next_job['payload'] == {'video_id': "vid_1", 'stage': "transcript", 'state': {'done': ["audio"]}}
+    assert worker.orchestrator.finished == [("audio", "vid_1")]
+
+def test_failure_with_retries_left_keeps_workspace(tmp_path):
+    worker = make_worker(tmp_path, max_attempts=2, error=RuntimeError("boom"))
+    workspace = worker.orchestrator.workspaces.job_workspace("vid_1")
+    job = lease_stage(worker, "audio")
+
+    asyncio.run(worker.process_job(job))
+
+    assert worker.job_queue.get_job(job['id'])['status'] == "pending"
+    assert os.path.isdir(workspace.directory)
+    assert worker.orchestrator.finished == []
+
+def test_failure_on_final_attempt_cleans_up_workspace(tmp_path):
+    worker = make_worker(tmp_path, max_attempts=1, error=RuntimeError("boom"))
+    workspace = worker.orchestrator.workspaces.job_workspace("vid_1")
+    job = lease_stage(worker, "audio")
+
+    asyncio.run(worker.process_job(job))
+
+    failed = worker.job_queue.get_job(job['id'])
+    assert failed['status'] == "failed"
+    assert failed['last_error'] == "boom"
+    assert not os.path.exists(workspace.directory)
+
+def test_lost_lease_drops_result(tmp_path):
+    worker = make_worker(tmp_path)
+    stale = lease_stage(worker, "audio")
+    time.sleep(1.1)
+    # Another worker picked the stage up after the lease expired
+    assert worker.job_queue.lease("io")['id'] == stale['id']
+
+    asyncio.run(worker.process_job(stale))
+
+    assert worker.job_queue.lease("cpu") is None
+    assert worker.orchestrator.finished == []
+
+def test_admission_sweeps_only_dead_queued_videos(tmp_path):
+    worker = make_worker(tmp_path, max_attempts=1)
+    workspaces = worker.orchestrator.workspaces
+    # vid_dead's workspace outlived its failed job, e.g. a crash before cleanup
+    worker.job_queue.enqueue("io", {'video_id': "vid_dead", 'stage': "audio", 'state': {}})
+    dead = worker.job_queue.lease("io")
+    worker.job_queue.fail(dead['id'], dead['lease_token'], "crashed")
+    workspaces.try_admit("vid_dead")
+    # vid_direct was made by create_and_publish_video and has no jobs row
+    workspaces.try_admit("vid_direct")
+
+    asyncio.run(worker.process_job(lease_stage(worker, "script", "vid_new")))
+
+    assert not os.path.exists(os.path.join(workspaces.root, "vid_dead"))
+    assert os.path.isdir(os.path.join(workspaces.root, "vid_direct"))
+    assert os.path.isdir(os.path.join(workspaces.root, "vid_new"))
+
+def test_deferred_stage_does_not_count_toward_max_jobs(tmp_path):
+    worker = make_worker(tmp_path)
+    worker.poll_interval = 1
+    workspaces = worker.orchestrator.workspaces
+    workspaces.quota_bytes = 1
+    workspaces.job_reserve_bytes = 10
+    # vid_busy fills the quota, so vid_new's first stage is deferred
+    workspaces.try_admit("vid_busy")
+    worker.job_queue.enqueue("io", {'video_id': "vid_new", 'stage': "script", 'state': {}})
+    worker.job_queue.enqueue("io", {'video_id': "vid_busy", 'stage': "audio", 'state': {}})
+
+    asyncio.run(worker.run(max_jobs=1))
+
+    assert worker.orchestrator.finished == [("audio", "vid_busy")]
+    assert not os.path.exists(os.path.join(workspaces.root, "vid_new"))
@@ -0,0 +1,83 @@
+import os
+import pytest
+from utils.workspace import WorkspaceManager
+
+@pytest.fixture
+def workspaces(tmp_path):
+    return WorkspaceManager(str(tmp_path / "temp"))
+
+def write(workspace, filename, size=10):
+    with open(workspace.path(filename), 'wb') as f:
+        f.write(b"x" * size)
+
+def test_artifact_deleted_after_last_consumer(workspaces):
+    workspace = workspaces.job_workspace("vid_1")
+    write(workspace, "audio.mp3")
+    workspace.register("audio.mp3", ["transcript", "assembly"])
+    write(workspace, "image_0.jpg")
+    workspace.register("image_0.jpg", ["videos"])
+
+    workspace.stage_finished("transcript")
+    assert os.path.exists(workspace.path("audio.mp3"))
+
+    workspace.stage_finished("videos")
+    assert not os.path.exists(workspace.path("image_0.jpg"))
+
+    workspace.stage_finished("assembly")
+    assert not os.path.exists(workspace.path("audio.mp3"))
+
+def test_manifest_is_shared_between_workspace_instances(workspaces):
+    write(workspaces.job_workspace("vid_1"), "video_0.mp4")
+    workspaces.job_workspace("vid_1").register("video_0.mp4", ["assembly"])
+
+    other = workspaces.job_workspace("vid_1")
+    other.stage_finished("assembly")
+    assert not os.path.exists(other.path("video_0.mp4"))
+
+def test_cleanup_only_touches_own_job(workspaces):
+    first = workspaces.job_workspace("vid_1")
+    second = workspaces.job_workspace("vid_2")
+    write(first, "audio.mp3")
+    write(second, "audio.mp3")
+
+    first.cleanup()
+    assert not os.path.exists(first.directory)
+    assert os.path.exists(second.path("audio.mp3"))
+
+def test_admission_reserves_footprint_before_files_are_written(tmp_path):
+    workspaces = WorkspaceManager(str(tmp_path / "temp"), quota_bytes=250, job_reserve_bytes=100)
+
+    assert workspaces.try_admit("vid_1")
+    assert workspaces.try_admit("vid_2")
+    # Nothing written yet, but two reservations leave no room for a third
+    assert not workspaces.try_admit("vid_3")
+    # An admitted job is always let back in
+    assert workspaces.try_admit("vid_1")
+
+    workspaces.job_workspace("vid_2").cleanup()
+    assert workspaces.try_admit("vid_3")
+
+def test_admission_counts_usage_beyond_reservation(tmp_path):
+    workspaces = WorkspaceManager(str(tmp_path / "temp"), quota_bytes=250, job_reserve_bytes=100)
+    workspaces.try_admit("vid_1")
+    write(workspaces.job_workspace("vid_1"), "final.mp4", size=200)
+
+    assert workspaces.committed_bytes() >= 200
+    assert not workspaces.try_admit("vid_2")
+
+def test_first_job_admitted_even_if_reservation_exceeds_quota(tmp_path):
+    workspaces = WorkspaceManager(str(tmp_path / "temp"), quota_bytes=50, job_reserve_bytes=100)
+
+    assert workspaces.try_admit("vid_1")
+    assert not workspaces.try_admit("vid_2")
+
+def test_sweep_only_removes_given_workspaces(workspaces):
+    for video_id in ["vid_active", "vid_dead", "vid_direct"]:
+        workspaces.try_admit(video_id)
+        write(workspaces.job_workspace(video_id), "audio.mp3")
+
+    removed = workspaces.sweep({"vid_dead", "vid_never_admitted"})
+
+    assert removed == ["vid_dead"]
+    assert os.path.isdir(os.path.join(workspaces.root, "vid_active"))
+    assert os.path.isdir(os.path.join(workspaces.root, "vid_direct"))
@@ -1,4 +1,4 @@
-import os
+import uuid
 from typing import Dict
 import logging
 from datetime import datetime
@@ -15,23 +15,7 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
-def create_temp_directory():
-    """Create temporary directory for file processing"""
-    temp_dir = "temp"
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
-    return temp_dir
-
 def generate_unique_id() -> str:
     """Generate a unique ID for each video project"""
-    return f"vid_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-def cleanup_temp_files(directory: str):
-    """Clean up temporary files after processing"""
-    for filename in os.listdir(directory):
-        file_path = os.path.join(directory, filename)
-        try:
-            if os.path.isfile(file_path):
-                os.unlink(file_path)
-        except Exception as e:
-            print(f"Error deleting {file_path}: {e}") 
\ No newline at end of file
+    # Suffix keeps ids unique when several jobs are enqueued in the same second
+    return f"vid_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
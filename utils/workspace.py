@@ -0,0 +1,199 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TMPFS_ROOT = "/dev/shm"
+MANIFEST_NAME = ".artifacts.json"
+ADMISSION_LOCK_NAME = ".admission.lock"
+
+class JobWorkspace:
+    """
+    Isolated directory for one video job
+
+    Each artifact is registered with the stages that still need it, and is
+    deleted as soon as the last of those stages finishes. The registry is
+    kept in a manifest file inside the directory so that stages running in
+    different worker processes share it. Artifacts are tracked by file name
+    relative to the workspace, so the workspace can be moved or remounted.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, filename: str) -> str:
+        """Path for a file inside this workspace"""
+        return os.path.join(self.directory, filename)
+
+    def register(self, filename: str, consumers: List[str]) -> None:
+        """Record which stages still have to read an artifact"""
+        artifacts = self._load_manifest()
+        artifacts[filename] = list(consumers)
+        self._save_manifest(artifacts)
+
+    def stage_finished(self, stage: str) -> None:
+        """Drop the stage from every artifact and delete artifacts nobody needs anymore"""
+        artifacts = self._load_manifest()
+        remaining = {}
+        for filename, consumers in artifacts.items():
+            consumers = [consumer for consumer in consumers if consumer != stage]
+            if consumers:
+                remaining[filename] = consumers
+            else:
+                self._delete(self.path(filename))
+        self._save_manifest(remaining)
+
+    def cleanup(self) -> None:
+        """Delete the whole workspace"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _delete(self, path: str) -> None:
+        try:
+            if os.path.isfile(path):
+                os.unlink(path)
+        except Exception as e:
+            logger.error(f"Error deleting {path}: {e}")
+
+    def _load_manifest(self) -> Dict[str, List[str]]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _save_manifest(self, artifacts: Dict[str, List[str]]) -> None:
+        # Write then rename so a crash never leaves a half-written manifest
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(artifacts, f)
+        os.replace(temp_path, self.manifest_path)
+
+class WorkspaceManager:
+    """
+    Hand out per-job workspaces under one root and enforce a disk quota
+
+    Every admitted job reserves job_reserve_bytes up front, or its actual
+    usage once it grows past that, so admission accounts for files a job
+    has not written yet. A new job is only admitted while the committed
+    total of all admitted jobs plus its own reservation fits under
+    quota_bytes. Jobs already admitted are never blocked, so they can
+    finish and free space. The quota covers everything under root, i.e.
+    every worker process on this node sharing it.
+    """
+
+    def __init__(
+        self,
+        root: str = "temp",
+        quota_bytes: Optional[int] = None,
+        job_reserve_bytes: int = 0,
+        use_tmpfs: bool = False
+    ):
+        if use_tmpfs:
+            if os.path.isdir(TMPFS_ROOT):
+                root = os.path.join(TMPFS_ROOT, os.path.basename(os.path.abspath(root)))
+            else:
+                logger.warning(f"{TMPFS_ROOT} not available, using {root} on disk")
+
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.job_reserve_bytes = job_reserve_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def job_workspace(self, video_id: str) -> JobWorkspace:
+        """Get (creating if needed) the workspace of a job"""
+        return JobWorkspace(os.path.join(self.root, video_id))
+
+    def disk_usage(self) -> int:
+        """Bytes currently used by all workspaces"""
+        return self._directory_usage(self.root)
+
+    def committed_bytes(self) -> int:
+        """Bytes used or reserved by all admitted jobs"""
+        return sum(
+            max(self._directory_usage(directory), self.job_reserve_bytes)
+            for directory in self._job_directories()
+        )
+
+    def try_admit(self, video_id: str) -> bool:
+        """
+        Admit a new job if its reservation fits under the quota
+
+        Creates the job's workspace on success; a job that already has one
+        was admitted before and is always let through.
+        """
+        directory = os.path.join(self.root, video_id)
+        with self._admission_lock():
+            if os.path.isdir(directory):
+                return True
+
+            # With nothing admitted, always let one job in so an undersized
+            # quota cannot block the node forever
+            if (
+                self.quota_bytes
+                and self._job_directories()
+                and self.committed_bytes() + self.job_reserve_bytes > self.quota_bytes
+            ):
+                return False
+
+            os.makedirs(directory)
+            return True
+
+    async def admit(self, video_id: str, poll_interval: float = 5) -> None:
+        """Wait until a new job is admitted"""
+        while not self.try_admit(video_id):
+            logger.info(f"Workspace quota reached under {self.root}, waiting to admit {video_id}")
+            await asyncio.sleep(poll_interval)
+
+    def sweep(self, inactive_video_ids: Set[str]) -> List[str]:
+        """
+        Delete workspaces of queued videos that have no job left to run
+
+        Catches workspaces left behind by crashed workers or by jobs whose
+        lease expired on their last attempt. Only the given video ids are
+        considered, so workspaces of videos made outside the queue (e.g. by
+        create_and_publish_video) are never touched.
+
+        Returns:
+            Video ids whose workspaces were deleted
+        """
+        removed = []
+        for video_id in sorted(inactive_video_ids):
+            directory = os.path.join(self.root, video_id)
+            if not os.path.isdir(directory):
+                continue
+
+            logger.info(f"Removing abandoned workspace {directory}")
+            shutil.rmtree(directory, ignore_errors=True)
+            removed.append(video_id)
+        return removed
+
+    def _job_directories(self) -> List[str]:
+        return [entry.path for entry in os.scandir(self.root) if entry.is_dir()]
+
+    def _directory_usage(self, directory: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    # Deleted by another job while walking
+                    pass
+        return total
+
+    @contextmanager
+    def _admission_lock(self) -> Iterator[None]:
+        """Serialize admission across every process sharing the root"""
+        with open(os.path.join(self.root, ADMISSION_LOCK_NAME), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
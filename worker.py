@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+from main import VideoCreationOrchestrator, PIPELINE_STAGES, load_config
+from services.job_queue import JobQueue
+from services.queue_worker import QueueWorker
+from utils.helpers import generate_unique_id
+
+STAGE_WORKER_CLASSES = dict(PIPELINE_STAGES)
+STAGE_ORDER = [stage for stage, _ in PIPELINE_STAGES]
+
+def enqueue_video(job_queue: JobQueue, topic: str, format_type: str, duration: int) -> str:
+    """Enqueue the first stage of a new video and return its video id"""
+    video_id = generate_unique_id()
+    first_stage = STAGE_ORDER[0]
+    job_queue.enqueue(
+        STAGE_WORKER_CLASSES[first_stage],
+        {
+            'video_id': video_id,
+            'stage': first_stage,
+            'state': VideoCreationOrchestrator.initial_state(topic, format_type, duration)
+        }
+    )
+    return video_id
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Video job queue producer and worker")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="Enqueue a new video job")
+    enqueue_parser.add_argument("--topic", required=True)
+    enqueue_parser.add_argument("--format-type", default="educational")
+    enqueue_parser.add_argument("--duration", type=int, default=30)
+
+    work_parser = subparsers.add_parser("work", help="Run a worker")
+    work_parser.add_argument(
+        "--worker-class",
+        choices=sorted(set(STAGE_WORKER_CLASSES.values())),
+        required=True
+    )
+    work_parser.add_argument("--max-jobs", type=int, default=None)
+
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    config = load_config()
+    job_queue = JobQueue(
+        config.JOB_QUEUE_PATH,
+        visibility_timeout=config.JOB_VISIBILITY_TIMEOUT,
+        max_attempts=config.JOB_MAX_ATTEMPTS
+    )
+
+    if args.command == "enqueue":
+        video_id = enqueue_video(job_queue, args.topic, args.format_type, args.duration)
+        print(f"Enqueued video {video_id}")
+        return
+
+    orchestrator = VideoCreationOrchestrator(config)
+    worker = QueueWorker(orchestrator, job_queue, PIPELINE_STAGES, args.worker_class)
+    try:
+        await worker.run(max_jobs=args.max_jobs)
+    finally:
+        orchestrator.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())